@@ -3,16 +3,46 @@
 # Description: Initializes the Telegram bot application.
 # ==============================================================================
 
-from telegram.ext import Application
+from telegram.ext import AIORateLimiter, Application
+from telegram.request import HTTPXRequest
 from core.config import settings
-from .handlers import get_handlers
+from .handlers import get_handlers, sample_system_job
 
 def create_bot_app():
     """ Creates and configures the Telegram bot Application instance. """
-    application = Application.builder().token(settings.TELEGRAM_BOT_TOKEN).build()
+    # Queue outgoing requests below Telegram's global (~30 msg/s) and
+    # per-group (~20 msg/min) limits so bursts back off instead of hitting
+    # RetryAfter errors.
+    rate_limiter = AIORateLimiter(
+        overall_max_rate=30,
+        overall_time_period=1,
+        group_max_rate=20,
+        group_time_period=60,
+        max_retries=3
+    )
+    # One shared connection pool for all outgoing Bot API calls so the
+    # broadcast fan-out reuses keep-alive connections instead of paying a
+    # TLS handshake per message. HTTP/2 multiplexes them over one socket
+    # (the h2 extra is pulled in via httpx[http2] in requirements.txt).
+    request = HTTPXRequest(
+        connection_pool_size=64,
+        http_version="2",
+        read_timeout=20,
+        connect_timeout=10
+    )
+    application = (
+        Application.builder()
+        .token(settings.TELEGRAM_BOT_TOKEN)
+        .request(request)
+        .rate_limiter(rate_limiter)
+        .build()
+    )
     
     handlers = get_handlers()
     for handler in handlers:
         application.add_handler(handler)
-        
+
+    # Sample CPU/memory in the background so /status only reads cached values.
+    application.job_queue.run_repeating(sample_system_job, interval=10, first=0)
+
     return application
@@ -13,7 +13,7 @@ from telegram.ext import (
     filters,
 )
 from loguru import logger
-import re
+import asyncio
 import os
 import time
 import psutil
@@ -26,54 +26,85 @@ from .keyboards import (
     get_start_keyboard,
     get_prefix_settings_keyboard
 )
-from scraper.engine import ScraperEngine
+from scraper.engine import get_engine
 from .messages import format_and_send_links, escape_markdown_v2
-from scraper.scheduler import check_website_job
+from scraper.scheduler import check_website_job, invalidate_channels_cache
 
 # --- Admin Filter & Start Time ---
 admin_filter = filters.User(user_id=settings.ADMIN_TELEGRAM_ID)
+_ADMIN_ID = settings.ADMIN_TELEGRAM_ID
 START_TIME = time.time()
 
+# Composed filters built once so get_handlers() doesn't reconstruct the
+# merged filter expressions on every call.
+_ADMIN_PRIVATE = filters.ChatType.PRIVATE & admin_filter
+_ADMIN_PRIVATE_TEXT = filters.TEXT & _ADMIN_PRIVATE
+_ADMIN_PRIVATE_FWD = filters.FORWARDED & _ADMIN_PRIVATE
+
+# --- Static Message Templates ---
+# These never change at runtime, so build them once at import instead of
+# re-assembling the escaped MarkdownV2 strings on every command.
+_ADMIN_WELCOME = (
+    "👑 *Welcome, Admin*\\!\n\n"
+    "This is your control panel\\. You have access to special commands to manage the bot\\.\n\n"
+    "`/checknow` \\- Manually trigger the website check\\.\n"
+    "`/channels` \\- Manage authorized channels\\.\n"
+    "`/prefixsettings` \\- Configure link prefixes\\.\n"
+    "`/status` \\- Show server and bot status\\.\n"
+    "`/stats` \\- Show bot statistics\\.\n"
+    "`/log` \\- Show recent log lines\\.\n"
+    "`/help` \\- Shows detailed command info\\."
+)
+_USER_WELCOME = (
+    "👋 *Welcome to the Link Scraper Bot*\\!\n\n"
+    "This bot automatically posts new file links into our channels\\.\n\n"
+    "Check out our channels below to get the latest updates\\!"
+)
+_HELP_TEXT = (
+    "*Admin Commands:*\n"
+    "`/checknow` \\- Manually trigger the website check\\.\n"
+    "`/test <url>` \\- Scrapes a single URL for testing\\.\n"
+    "`/channels` \\- Opens the channel management panel\\.\n"
+    "`/prefixsettings` \\- Opens the prefix management panel\\.\n"
+    "`/status` \\- Shows server and bot status\\.\n"
+    "`/stats` \\- Shows bot statistics\\.\n"
+    "`/log` \\- Shows recent log lines\\.\n\n"
+    "*How to Authorize a New Channel:*\n"
+    "1\\. Add me to your channel and promote me to an *Administrator*\\.\n"
+    "2\\. Forward *any message* from that channel to me here in this private chat\\."
+)
+
+# Short-lived cache for the channel list so a callback-triggered refresh
+# doesn't re-query Mongo for data fetched moments earlier.
+_CHANNELS_CACHE_KEY = '_channels_cache'
+_CHANNELS_CACHE_TTL = 5.0
+
+async def _get_channels_cached(context: ContextTypes.DEFAULT_TYPE) -> tuple[list, int | None]:
+    """ Returns (channels, main_channel_id), caching the result briefly. """
+    cached = context.bot_data.get(_CHANNELS_CACHE_KEY)
+    if cached and time.monotonic() - cached[0] < _CHANNELS_CACHE_TTL:
+        return cached[1], cached[2]
+    channels, main_channel = await asyncio.gather(
+        Database.get_all_channels(), Database.get_main_channel()
+    )
+    main_channel_id = main_channel['channel_id'] if main_channel else None
+    context.bot_data[_CHANNELS_CACHE_KEY] = (time.monotonic(), channels, main_channel_id)
+    return channels, main_channel_id
+
+def _invalidate_channels_cache(context: ContextTypes.DEFAULT_TYPE):
+    context.bot_data.pop(_CHANNELS_CACHE_KEY, None)
+    # The scheduler keeps its own TTL'd copy of the channel list.
+    invalidate_channels_cache()
+
 # --- Command Handlers ---
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = update.effective_user.id
     keyboard = get_start_keyboard()
-    if user_id == settings.ADMIN_TELEGRAM_ID:
-        text = (
-            "👑 *Welcome, Admin*\\!\n\n"
-            "This is your control panel\\. You have access to special commands to manage the bot\\.\n\n"
-            "`/checknow` \\- Manually trigger the website check\\.\n"
-            "`/channels` \\- Manage authorized channels\\.\n"
-            "`/prefixsettings` \\- Configure link prefixes\\.\n"
-            "`/status` \\- Show server and bot status\\.\n"
-            "`/stats` \\- Show bot statistics\\.\n"
-            "`/log` \\- Show recent log lines\\.\n"
-            "`/help` \\- Shows detailed command info\\."
-        )
-    else:
-        text = (
-            "👋 *Welcome to the Link Scraper Bot*\\!\n\n"
-            "This bot automatically posts new file links into our channels\\.\n\n"
-            "Check out our channels below to get the latest updates\\!"
-        )
+    text = _ADMIN_WELCOME if update.effective_user.id == _ADMIN_ID else _USER_WELCOME
     await update.message.reply_text(text, reply_markup=keyboard, parse_mode=ParseMode.MARKDOWN_V2)
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    help_text = (
-        "*Admin Commands:*\n"
-        "`/checknow` \\- Manually trigger the website check\\.\n"
-        "`/test <url>` \\- Scrapes a single URL for testing\\.\n"
-        "`/channels` \\- Opens the channel management panel\\.\n"
-        "`/prefixsettings` \\- Opens the prefix management panel\\.\n"
-        "`/status` \\- Shows server and bot status\\.\n"
-        "`/stats` \\- Shows bot statistics\\.\n"
-        "`/log` \\- Shows recent log lines\\.\n\n"
-        "*How to Authorize a New Channel:*\n"
-        "1\\. Add me to your channel and promote me to an *Administrator*\\.\n"
-        "2\\. Forward *any message* from that channel to me here in this private chat\\."
-    )
-    await update.message.reply_text(help_text, parse_mode=ParseMode.MARKDOWN_V2)
+    await update.message.reply_text(_HELP_TEXT, parse_mode=ParseMode.MARKDOWN_V2)
 
 async def check_now_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("⏳ Manually triggering the website check now. Please wait...")
@@ -90,7 +121,7 @@ async def test_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     url = context.args[0]
     await update.message.reply_text(f"Testing scraper on: {escape_markdown_v2(url)}", parse_mode=ParseMode.MARKDOWN_V2)
-    scraper = ScraperEngine()
+    scraper = get_engine()
     result = await scraper.scrape_post(url)
     
     # --- FIX: Unpack all four values from the advanced scraper ---
@@ -121,43 +152,81 @@ async def test_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Scraping failed. No links found or an error occurred. Check logs.")
 
 async def channels_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    channels = await Database.get_all_channels()
+    channels, main_channel_id = await _get_channels_cached(context)
     if not channels:
         await update.message.reply_text("No channels have been authorized yet.")
         return
-    main_channel = await Database.get_main_channel()
-    main_channel_id = main_channel['channel_id'] if main_channel else None
     keyboard = get_channel_management_keyboard(channels, main_channel_id)
     await update.message.reply_text("Authorized Channels:", reply_markup=keyboard)
 
 async def prefix_settings_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    is_enabled = await Database.is_prefix_enabled()
-    prefix = await Database.get_prefix()
+    is_enabled, prefix = await asyncio.gather(
+        Database.is_prefix_enabled(), Database.get_prefix()
+    )
     keyboard = get_prefix_settings_keyboard(is_enabled, prefix)
     await update.message.reply_text("Manage the link prefix settings below:", reply_markup=keyboard)
 
+# Latest system metrics, refreshed by a background job so /status never has
+# to touch /proc on the request path. A single cached Process handle avoids
+# re-parsing /proc/self/stat, and its counters describe the bot itself rather
+# than the whole machine. The first cpu_percent() call primes the counter.
+_PROC = psutil.Process()
+_PROC.cpu_percent(interval=None)
+_SYS = {"cpu": 0.0, "mem": 0.0, "rss_mb": 0.0}
+
+async def sample_system_job(context: ContextTypes.DEFAULT_TYPE):
+    """ Periodic JobQueue task that snapshots CPU and memory usage. """
+    _SYS["cpu"] = _PROC.cpu_percent()
+    _SYS["mem"] = psutil.virtual_memory().percent
+    _SYS["rss_mb"] = _PROC.memory_info().rss / (1024 * 1024)
+
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     uptime_seconds = time.time() - START_TIME
     uptime_str = f"{int(uptime_seconds // 3600)}h {int((uptime_seconds % 3600) // 60)}m {int(uptime_seconds % 60)}s"
-    mem = psutil.virtual_memory()
-    cpu = psutil.cpu_percent()
+    # Only the dynamic values need escaping; escaping the whole template
+    # would mangle the * and ` formatting characters.
+    mem_pct = escape_markdown_v2(_SYS['mem'])
+    cpu_pct = escape_markdown_v2(_SYS['cpu'])
+    rss_mb = escape_markdown_v2(f"{_SYS['rss_mb']:.1f}")
     text = (
         "*Server Status:*\n"
         f"Uptime: `{uptime_str}`\n"
-        f"Memory: `{mem.percent}%` used\n"
-        f"CPU: `{cpu}%`"
+        f"Memory: `{mem_pct}%` used \\(bot: `{rss_mb} MB`\\)\n"
+        f"CPU \\(bot\\): `{cpu_pct}%`"
     )
-    await update.message.reply_text(escape_markdown_v2(text), parse_mode=ParseMode.MARKDOWN_V2)
+    await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN_V2)
 
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    total_channels = len(await Database.get_all_channels())
-    total_links = await Database.get_total_links()
+    channels, total_links = await asyncio.gather(
+        Database.get_all_channels(), Database.get_total_links()
+    )
+    total_channels = len(channels)
     text = (
         "*Bot Stats:*\n"
         f"Authorized Channels: `{total_channels}`\n"
         f"Total Links Processed: `{total_links}`"
     )
-    await update.message.reply_text(escape_markdown_v2(text), parse_mode=ParseMode.MARKDOWN_V2)
+    await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN_V2)
+
+def _tail(path: str, n: int = 20, block: int = 8192) -> list[str]:
+    """
+    Reads the last n lines of a file by seeking backwards in fixed-size
+    blocks, so the cost stays constant no matter how large the log grows.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        chunks = []
+        newlines = 0
+        while size > 0 and newlines <= n:
+            read_size = min(block, size)
+            size -= read_size
+            f.seek(size)
+            chunk = f.read(read_size)
+            newlines += chunk.count(b'\n')
+            chunks.append(chunk)
+    data = b"".join(reversed(chunks))
+    return [line.decode('utf-8', errors='replace') for line in data.splitlines(keepends=True)[-n:]]
 
 async def log_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     log_path = "logs/bot.log"
@@ -165,8 +234,7 @@ async def log_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("No log file found yet.")
         return
     try:
-        with open(log_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()[-20:]
+        lines = await asyncio.to_thread(_tail, log_path, 20)
         text = "```\n--- Last 20 Log Lines ---\n" + "".join(lines) + "\n```"
         if len(text) > 4096:
             text = text[:4090] + "\n...```"
@@ -180,21 +248,22 @@ async def forwarded_message_handler(update: Update, context: ContextTypes.DEFAUL
         await update.message.reply_text("Please forward a message directly from the channel you wish to authorize.")
         return
     channel = forward_origin.chat
+    safe_title = escape_markdown_v2(channel.title)
     logger.info(f"Admin forwarded a message from channel '{channel.title}' ({channel.id}) for authorization check.")
     try:
         bot_member = await context.bot.get_chat_member(chat_id=channel.id, user_id=context.bot.id)
         if bot_member.status == ChatMember.ADMINISTRATOR:
             keyboard = get_channel_approval_keyboard(channel.id)
             await update.message.reply_text(
-                f"I am an admin in *{escape_markdown_v2(channel.title)}*\\.\n\nPlease approve or deny my participation in this channel\\.",
+                f"I am an admin in *{safe_title}*\\.\n\nPlease approve or deny my participation in this channel\\.",
                 reply_markup=keyboard,
                 parse_mode=ParseMode.MARKDOWN_V2
             )
         else:
-            await update.message.reply_text(f"I am not an admin in *{escape_markdown_v2(channel.title)}*\\.", parse_mode=ParseMode.MARKDOWN_V2)
+            await update.message.reply_text(f"I am not an admin in *{safe_title}*\\.", parse_mode=ParseMode.MARKDOWN_V2)
     except Exception as e:
         logger.error(f"Failed to check bot status in channel {channel.id}: {e}")
-        await update.message.reply_text(f"Could not verify my status in the channel *{escape_markdown_v2(channel.title)}*\\.", parse_mode=ParseMode.MARKDOWN_V2)
+        await update.message.reply_text(f"Could not verify my status in the channel *{safe_title}*\\.", parse_mode=ParseMode.MARKDOWN_V2)
 
 async def text_message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if update.message.reply_to_message and context.user_data.get('awaiting_prefix_message_id') == update.message.reply_to_message.message_id:
@@ -205,62 +274,99 @@ async def text_message_handler(update: Update, context: ContextTypes.DEFAULT_TYP
         await update.message.reply_text(f"✅ Prefix has been updated to: `{escape_markdown_v2(new_prefix)}`", parse_mode=ParseMode.MARKDOWN_V2)
         await prefix_settings_command(update, context)
 
+async def _approve_channel_callback(query, context: ContextTypes.DEFAULT_TYPE, channel_id: int):
+    try:
+        chat = await context.bot.get_chat(channel_id)
+        safe_title = escape_markdown_v2(chat.title)
+        is_main = await Database.add_channel(channel_id, chat.title)
+        _invalidate_channels_cache(context)
+        main_text = " and set as the MAIN channel" if is_main else ""
+        await query.edit_message_text(f"✅ Approved channel *{safe_title}*{escape_markdown_v2(main_text)}\\.", parse_mode=ParseMode.MARKDOWN_V2)
+        await context.bot.send_message(channel_id, "This channel has been approved for receiving feeds\\.")
+    except Exception as e:
+        await query.edit_message_text(f"Error approving channel: {e}")
+
+async def _deny_channel_callback(query, context: ContextTypes.DEFAULT_TYPE, channel_id: int):
+    await query.edit_message_text(f"❌ Denied channel access. I will now leave this channel.")
+    try:
+        await context.bot.leave_chat(channel_id)
+    except Exception as e:
+        logger.error(f"Could not leave chat {channel_id}: {e}")
+
+async def _set_main_callback(query, context: ContextTypes.DEFAULT_TYPE, channel_id: int):
+    success = await Database.set_main_channel(channel_id)
+    _invalidate_channels_cache(context)
+    if success:
+        await query.edit_message_text("✅ New main channel has been set.")
+    else:
+        await query.edit_message_text("❌ Failed to set new main channel.")
+    if query.message:
+        await channels_command(query.message, context)
+
+async def _toggle_prefix_callback(query, context: ContextTypes.DEFAULT_TYPE):
+    current_status = await Database.is_prefix_enabled()
+    new_status = not current_status
+    # The read must follow the toggle: overlapping them can repopulate the
+    # prefix-config cache with the pre-toggle state.
+    await Database.toggle_prefix(new_status)
+    prefix = await Database.get_prefix()
+    keyboard = get_prefix_settings_keyboard(new_status, prefix)
+    await query.edit_message_text("Manage the link prefix settings below:", reply_markup=keyboard)
+
+async def _set_prefix_prompt_callback(query, context: ContextTypes.DEFAULT_TYPE):
+    prompt_message = await query.message.reply_text("Please **reply to this message** with your new prefix.", parse_mode='Markdown')
+    context.user_data['awaiting_prefix_message_id'] = prompt_message.message_id
+    await query.delete_message()
+
+# Dispatch tables: exact-match callbacks first, then callbacks whose data
+# carries a channel id after a fixed prefix. Slicing off the prefix avoids
+# the per-click list allocation of data.split("_").
+_CB_EXACT = {
+    "toggle_prefix_status": _toggle_prefix_callback,
+    "set_prefix_prompt": _set_prefix_prompt_callback,
+}
+_CB_PREFIXED = (
+    ("approve_channel_", _approve_channel_callback),
+    ("deny_channel_", _deny_channel_callback),
+    ("set_main_", _set_main_callback),
+)
+
 async def button_callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
+    # The CallbackQueryHandler is unfiltered, so reject strangers before any
+    # database or Bot API work happens on their behalf.
+    if update.effective_user.id != _ADMIN_ID:
+        await query.answer("Not authorized", show_alert=True)
+        return
+    # cache_time lets the client suppress the loading spinner on repeat
+    # clicks without another answer round trip.
+    await query.answer(cache_time=5)
     data = query.data
-    if data.startswith("approve_channel_"):
-        channel_id = int(data.split("_")[2])
-        try:
-            chat = await context.bot.get_chat(channel_id)
-            is_main = await Database.add_channel(channel_id, chat.title)
-            main_text = " and set as the MAIN channel" if is_main else ""
-            await query.edit_message_text(f"✅ Approved channel *{escape_markdown_v2(chat.title)}*{escape_markdown_v2(main_text)}\\.", parse_mode=ParseMode.MARKDOWN_V2)
-            await context.bot.send_message(channel_id, "This channel has been approved for receiving feeds\\.")
-        except Exception as e:
-            await query.edit_message_text(f"Error approving channel: {e}")
-    elif data.startswith("deny_channel_"):
-        channel_id = int(data.split("_")[2])
-        await query.edit_message_text(f"❌ Denied channel access. I will now leave this channel.")
-        try:
-            await context.bot.leave_chat(channel_id)
-        except Exception as e:
-            logger.error(f"Could not leave chat {channel_id}: {e}")
-    elif data.startswith("set_main_"):
-        channel_id = int(data.split("_")[2])
-        success = await Database.set_main_channel(channel_id)
-        if success:
-            await query.edit_message_text("✅ New main channel has been set.")
-        else:
-            await query.edit_message_text("❌ Failed to set new main channel.")
-        if query.message:
-            await channels_command(query.message, context)
-    elif data == "toggle_prefix_status":
-        current_status = await Database.is_prefix_enabled()
-        new_status = not current_status
-        await Database.toggle_prefix(new_status)
-        prefix = await Database.get_prefix()
-        keyboard = get_prefix_settings_keyboard(new_status, prefix)
-        await query.edit_message_text("Manage the link prefix settings below:", reply_markup=keyboard)
-    elif data == "set_prefix_prompt":
-        prompt_message = await query.message.reply_text("Please **reply to this message** with your new prefix.", parse_mode='Markdown')
-        context.user_data['awaiting_prefix_message_id'] = prompt_message.message_id
-        await query.delete_message()
-    elif data.startswith("info_"):
-        pass
+    if data.startswith("info_"):
+        return
+    exact = _CB_EXACT.get(data)
+    if exact:
+        await exact(query, context)
+        return
+    for prefix, callback in _CB_PREFIXED:
+        if data.startswith(prefix):
+            await callback(query, context, int(data[len(prefix):]))
+            return
 
 def get_handlers():
     return [
         CommandHandler("start", start_command),
         CommandHandler("help", help_command, filters=admin_filter),
-        CommandHandler("test", test_command, filters=admin_filter),
+        # /test and /checknow can run for tens of seconds while scraping, so
+        # dispatch them non-blocking to keep other updates flowing.
+        CommandHandler("test", test_command, filters=admin_filter, block=False),
         CommandHandler("channels", channels_command, filters=admin_filter),
         CommandHandler("prefixsettings", prefix_settings_command, filters=admin_filter),
-        CommandHandler("checknow", check_now_command, filters=admin_filter),
+        CommandHandler("checknow", check_now_command, filters=admin_filter, block=False),
         CommandHandler("status", status_command, filters=admin_filter),
         CommandHandler("stats", stats_command, filters=admin_filter),
         CommandHandler("log", log_command, filters=admin_filter),
-        MessageHandler(filters.FORWARDED & filters.ChatType.PRIVATE & admin_filter, forwarded_message_handler),
-        MessageHandler(filters.TEXT & filters.ChatType.PRIVATE & admin_filter, text_message_handler),
+        MessageHandler(_ADMIN_PRIVATE_FWD, forwarded_message_handler),
+        MessageHandler(_ADMIN_PRIVATE_TEXT, text_message_handler),
         CallbackQueryHandler(button_callback_handler)
     ]
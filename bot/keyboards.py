@@ -3,20 +3,24 @@
 # Description: Creates interactive inline keyboards for the bot. (PREFIX UI UPDATE)
 # ==============================================================================
 
+import functools
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
-def get_start_keyboard():
-    """ Creates the keyboard with external channel links for the /start command. """
-    keyboard = [
-        [
-            InlineKeyboardButton("📢 Update Channel", url="https://t.me/filmyspotupdate"),
-            InlineKeyboardButton("🎬 Movie Channel", url="https://t.me/+o_VcAI8GRQ8zYzA9")
-        ],
-        [
-             InlineKeyboardButton("🛜 Movie feed Update 🛜", url="https://t.me/+kV83Xa2xaeE5N2Jl")
-        ]
+# The /start keyboard never changes, so build it once at import.
+_START_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📢 Update Channel", url="https://t.me/filmyspotupdate"),
+        InlineKeyboardButton("🎬 Movie Channel", url="https://t.me/+o_VcAI8GRQ8zYzA9")
+    ],
+    [
+        InlineKeyboardButton("🛜 Movie feed Update 🛜", url="https://t.me/+kV83Xa2xaeE5N2Jl")
     ]
-    return InlineKeyboardMarkup(keyboard)
+])
+
+def get_start_keyboard():
+    """ Returns the static keyboard with external channel links for /start. """
+    return _START_KEYBOARD
 
 def get_prefix_settings_keyboard(is_enabled: bool, prefix: str | None):
     """ Creates the new, advanced UI for managing prefix settings. """
@@ -45,12 +49,11 @@ def get_channel_approval_keyboard(channel_id: int):
     ]
     return InlineKeyboardMarkup(keyboard)
 
-def get_channel_management_keyboard(channels: list, main_channel_id: int | None):
-    """ Creates the new, advanced UI for managing channels. """
+@functools.lru_cache(maxsize=64)
+def _channel_management_keyboard(channel_items: tuple, main_channel_id: int | None):
+    """ Memoized builder keyed on the hashable (id, name) channel tuple. """
     keyboard = []
-    for channel in channels:
-        channel_id = channel['channel_id']
-        channel_name = channel['channel_name']
+    for channel_id, channel_name in channel_items:
         button_row = []
         if channel_id == main_channel_id:
             button_text = f"✅ {channel_name} (Main)"
@@ -61,3 +64,8 @@ def get_channel_management_keyboard(channels: list, main_channel_id: int | None)
             button_row.append(InlineKeyboardButton("Set as Main ➡️", callback_data=f"set_main_{channel_id}"))
         keyboard.append(button_row)
     return InlineKeyboardMarkup(keyboard)
+
+def get_channel_management_keyboard(channels: list, main_channel_id: int | None):
+    """ Creates the advanced UI for managing channels. """
+    channel_items = tuple((c['channel_id'], c['channel_name']) for c in channels)
+    return _channel_management_keyboard(channel_items, main_channel_id)
@@ -4,22 +4,30 @@
 # ==============================================================================
 
 import asyncio
+import signal
 from loguru import logger
 
 from core.logger import setup_logger
 from bot.bot_instance import create_bot_app
+from database.mongo_db import Database
+from scraper.engine import close_engine
 from scraper.scheduler import setup_scheduler
 
 async def main():
     """ Main asynchronous function to initialize and run the bot and scheduler. """
     setup_logger()
-    
+    app = None
+
     try:
+        # Connect to Mongo up front so the pool is warm before the first
+        # user command or scheduler tick hits the database.
+        await Database.initialize()
+
         app = create_bot_app()
-        
+
         # Initialize the application but don't start polling yet
         await app.initialize()
-        
+
         # Setup and start the scheduler
         setup_scheduler(app.bot)
 
@@ -29,12 +37,29 @@ async def main():
         # Start polling for updates
         await app.updater.start_polling()
 
-        # Keep the script running
-        while True:
-            await asyncio.sleep(3600) # Sleep for an hour, or any long duration
+        # Idle until SIGINT/SIGTERM instead of waking up hourly; the event
+        # also gives orchestrators a deterministic graceful-shutdown path.
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await stop.wait()
+        logger.info("Shutdown signal received, stopping...")
 
     except Exception as e:
         logger.critical(f"A critical error occurred in the main async loop: {e}")
+    finally:
+        if app:
+            try:
+                if app.updater.running:
+                    await app.updater.stop()
+                if app.running:
+                    await app.stop()
+                await app.shutdown()
+            except Exception as e:
+                logger.error(f"Error during bot shutdown: {e}")
+        await close_engine()
+        await Database.close_connection()
 
 if __name__ == "__main__":
     try:
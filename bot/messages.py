@@ -3,60 +3,130 @@
 # Description: Handles formatting and sending messages via Telegram. (FINAL FIX)
 # ==============================================================================
 
+import functools
+from collections import defaultdict
+
+from aiolimiter import AsyncLimiter
 from telegram import Bot
 from telegram.constants import ParseMode
+from telegram.error import BadRequest, RetryAfter, TimedOut
 from loguru import logger
-import re
 import asyncio
-import io
 
 from database.mongo_db import Database
 
+# Token buckets matching Telegram's documented limits: ~30 msg/s per bot
+# globally and ~20 msg/min per chat. Sends run concurrently under these
+# instead of sleeping a fixed 0.5s between each message.
+_BOT_LIMITER = AsyncLimiter(30, 1)
+_chat_limiters: dict[int, AsyncLimiter] = defaultdict(lambda: AsyncLimiter(20, 60))
+
+# Stay safely under Telegram's 4096-character message limit when packing
+# several link entries into one message.
+_MAX_CHUNK_LEN = 3800
+
+# Every escape is a single character mapped to backslash + itself, so a
+# translate table does the whole job in one C-level pass with no regex engine.
+_MD2_ESCAPE_TABLE = {ord(c): '\\' + c for c in r'_*[]()~`>#+-=|{}.!'}
+
 def escape_markdown_v2(text: str) -> str:
-    text = str(text)
-    escape_chars = r'_*[]()~`>#+-=|{}.!'
-    return re.sub(f'([{re.escape(escape_chars)}])', r'\\\1', text)
+    return str(text).translate(_MD2_ESCAPE_TABLE)
+
+# Quality/language/size tags come from a small fixed vocabulary that recurs
+# across thousands of posts, so memoize those escapes. Titles and URLs are
+# unique per post and keep using the raw function.
+@functools.lru_cache(maxsize=512)
+def _escape_cached(text: str) -> str:
+    return escape_markdown_v2(text)
+
+# Below this many links the formatting cost is a few µs and the thread hop
+# in format_and_send_links would cost more than it saves.
+_TO_THREAD_THRESHOLD = 4
+
+def _build_messages(post_title: str, links: list, status: str, quality_tags: list | None,
+                    metadata: dict | None, prefix_enabled: bool, prefix_text: str | None) -> list[str]:
+    """
+    Pure formatting half: builds the header plus packed link chunks and
+    returns them in send order. No I/O, so it can run off the event loop.
+    """
+    # --- Build the header in one pass ---
+    # Accumulate string fragments and join once, instead of growing
+    # intermediate lists and formatting each tag twice.
+    parts = ['*', escape_markdown_v2(post_title), '*\n\n']
+    if status == "new":
+        parts.append("\\#new\\_feed ")
+    elif status == "updated":
+        parts.append("\\#updated\\_feed ")
+
+    if quality_tags:
+        for tag in quality_tags:
+            parts.append(_escape_cached(tag))
+            parts.append(' ')
+
+    if metadata:
+        for lang in metadata.get('language_tags') or ():
+            parts.append('\\#')
+            parts.append(_escape_cached(lang))
+            parts.append(' ')
+        for size in metadata.get('file_sizes') or ():
+            parts.append('\\#')
+            parts.append(_escape_cached(size))
+            parts.append(' ')
+
+    messages = [''.join(parts).rstrip()]
+
+    # Pack the per-link entries into as few messages as possible under
+    # Telegram's 4096-char cap (with headroom), instead of one API call per
+    # link. A 20-link post typically collapses into one or two messages.
+    entries = []
+    for link in links:
+        final_url = f"{prefix_text} {link.url}" if prefix_enabled and prefix_text else link.url
+        entries.append(f"_{escape_markdown_v2(link.title)}_\n`{escape_markdown_v2(final_url)}`")
+
+    current: list[str] = []
+    current_len = 0
+    for entry in entries:
+        # +2 accounts for the blank-line separator between entries.
+        if current and current_len + len(entry) + 2 > _MAX_CHUNK_LEN:
+            messages.append("\n\n".join(current))
+            current = []
+            current_len = 0
+        current.append(entry)
+        current_len += len(entry) + 2
+    if current:
+        messages.append("\n\n".join(current))
+
+    return messages
 
 async def format_and_send_links(bot: Bot, chat_id: int, post_title: str, links: list, status: str, quality_tags: list = None, metadata: dict = None):
     """
     Formats scraped links and sends them to a Telegram channel.
     Includes status, quality, and metadata tags in the header.
     """
+    # The scraper already excludes magnet links, so anything here is sendable.
     if not links:
         logger.warning("format_and_send_links called with no links to send.")
         return
 
-    torrent_links = [link for link in links if not link.get('url', '').startswith('magnet:')]
-    if not torrent_links:
-        logger.info(f"No .torrent files found for post '{post_title}'. Nothing to send.")
-        return
+    prefix_enabled, prefix_text = await Database.get_prefix_config()
 
-    # --- Build the tag string ---
-    all_tags = []
-    if status == "new":
-        all_tags.append("\\#new\\_feed")
-    elif status == "updated":
-        all_tags.append("\\#updated\\_feed")
+    # Large posts do enough string work that it is worth hopping to a worker
+    # thread so other handlers stay responsive; small ones format inline.
+    if len(links) > _TO_THREAD_THRESHOLD:
+        messages = await asyncio.to_thread(
+            _build_messages, post_title, links, status, quality_tags,
+            metadata, prefix_enabled, prefix_text
+        )
+    else:
+        messages = _build_messages(
+            post_title, links, status, quality_tags,
+            metadata, prefix_enabled, prefix_text
+        )
 
-    if quality_tags:
-        all_tags.extend([escape_markdown_v2(tag) for tag in quality_tags])
-    
-    # Add metadata tags if they exist
-    if metadata:
-        if metadata.get('language_tags'):
-            # FIX: Escape each language tag to prevent parsing errors
-            all_tags.extend([f"\\#{escape_markdown_v2(lang)}" for lang in metadata['language_tags']])
-        if metadata.get('file_sizes'):
-            # FIX: Escape each file size tag to prevent parsing errors from characters like '.'
-            all_tags.extend([f"\\#{escape_markdown_v2(size)}" for size in metadata['file_sizes']])
-
-    tags_string = " ".join(all_tags)
-    
-    header_message = f"*{escape_markdown_v2(post_title)}*\n\n{tags_string}"
     try:
         await bot.send_message(
             chat_id=chat_id,
-            text=header_message,
+            text=messages[0],
             parse_mode=ParseMode.MARKDOWN_V2,
             disable_web_page_preview=True
         )
@@ -64,23 +134,30 @@ async def format_and_send_links(bot: Bot, chat_id: int, post_title: str, links:
         logger.error(f"Failed to send header message to {chat_id}: {e}")
         return
 
-    prefix_enabled = await Database.is_prefix_enabled()
-    prefix_text = await Database.get_prefix() if prefix_enabled else ""
-
-    for link in torrent_links:
-        try:
-            link_title = link.get('title', 'No Title')
-            link_url = link.get('url', 'No URL')
-            
-            final_url = f"{prefix_text} {link_url}" if prefix_enabled and prefix_text else link_url
-            message_body = f"_{escape_markdown_v2(link_title)}_\n`{escape_markdown_v2(final_url)}`"
-
-            await bot.send_message(
-                chat_id=chat_id,
-                text=message_body,
-                parse_mode=ParseMode.MARKDOWN_V2,
-                disable_web_page_preview=True
-            )
-            await asyncio.sleep(0.5)
-        except Exception as e:
-            logger.error(f"Failed to send link message for '{link.get('title')}' to {chat_id}: {e}", exc_info=True)
+    chat_limiter = _chat_limiters[chat_id]
+
+    for chunk in messages[1:]:
+        # Transient errors get one cheap retry; only genuinely malformed
+        # requests are worth the cost of a full traceback.
+        for attempt in range(2):
+            try:
+                async with _BOT_LIMITER, chat_limiter:
+                    await bot.send_message(
+                        chat_id=chat_id,
+                        text=chunk,
+                        parse_mode=ParseMode.MARKDOWN_V2,
+                        disable_web_page_preview=True
+                    )
+                break
+            except RetryAfter as e:
+                logger.warning(f"Rate limited sending to {chat_id}; waiting {e.retry_after}s")
+                await asyncio.sleep(e.retry_after)
+            except TimedOut:
+                logger.warning(f"Telegram timeout sending link chunk to {chat_id}")
+                break
+            except BadRequest as e:
+                logger.opt(exception=e).error(f"Bad request sending link chunk to {chat_id}")
+                break
+            except Exception as e:
+                logger.error(f"Failed to send link chunk to {chat_id}: {e}")
+                break
@@ -16,9 +16,11 @@ class Settings:
         logger.info("Loading application settings...")
         self.TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
         self.MONGO_DB_URI = os.getenv("MONGO_DB_URI")
+        self.MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "link_scraper_bot")
         self.ADMIN_TELEGRAM_ID = int(os.getenv("ADMIN_TELEGRAM_ID", 0))
         self.PROXY_URL = os.getenv("PROXY_URL")
         self.TARGET_WEBSITE_URL = os.getenv("TARGET_WEBSITE_URL")
+        self.MAX_CONCURRENT_SCRAPES = int(os.getenv("MAX_CONCURRENT_SCRAPES", 16))
 
         self._validate()
         logger.info("Settings loaded and validated successfully.")
@@ -13,16 +13,25 @@ def setup_logger():
     os.makedirs("logs", exist_ok=True)
     
     logger.remove()
+    # enqueue=True hands records to a background thread so log I/O (disk
+    # writes, rotation) never blocks the event loop; diagnose=False skips
+    # loguru's expensive variable-dump traceback formatting.
     logger.add(
         sys.stderr,
         level="INFO",
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+        enqueue=True,
+        backtrace=False,
+        diagnose=False
     )
     logger.add(
         "logs/bot.log",
         rotation="10 MB",
         retention="7 days",
         level="DEBUG",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+        enqueue=True,
+        backtrace=False,
+        diagnose=False
     )
     logger.info("Logger has been configured.")
@@ -3,19 +3,35 @@
 # Description: Handles all database interactions with MongoDB.
 # ==============================================================================
 
+import asyncio
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
 from pymongo.errors import ConnectionFailure, OperationFailure
 from loguru import logger
 from core.config import settings
 
+# Hoisted so every timestamp uses the same tz object; naive datetimes are
+# both DST-unsafe and force a local-time conversion on every BSON encode.
+_UTC = timezone.utc
+
 # --- Database Class ---
 class Database:
     """ A singleton class for all database operations """
-    client: AsyncIomMotorClient = None
+    client: AsyncIOMotorClient = None
     db = None
 
+    # Serializes first-time initialization so concurrent scheduler/handler
+    # coroutines can't each construct their own client (and pool).
+    _init_lock = asyncio.Lock()
+
+    # The prefix config changes only when the admin edits it, so cache it
+    # briefly instead of hitting Mongo on every broadcast.
+    _prefix_cache = {"ts": 0.0, "data": None}
+    _PREFIX_CACHE_TTL = 30.0
+
     @staticmethod
     async def initialize():
         """
@@ -25,20 +41,57 @@ class Database:
         if Database.client and Database.db:
             return
 
-        if not settings.MONGO_DB_URI:
-            logger.critical("❌ MONGO_DB_URI is not set in the environment or .env file. Exiting.")
-            raise ValueError("MONGO_DB_URI is not configured.")
+        async with Database._init_lock:
+            # Another coroutine may have finished initializing while we
+            # waited on the lock.
+            if Database.client and Database.db:
+                return
 
-        logger.info(f"🔌 Connecting to MongoDB database: {settings.MONGO_DB_NAME}")
-        try:
-            Database.client = AsyncIOMotorClient(settings.MONGO_DB_URI)
-            # The ismaster command is cheap and does not require auth.
-            await Database.client.admin.command('ismaster')
-            Database.db = Database.client[settings.MONGO_DB_NAME]
-            logger.success("✅ MongoDB connection successful.")
-        except ConnectionFailure as e:
-            logger.critical(f"💥 MongoDB connection failed: {e}")
-            raise
+            if not settings.MONGO_DB_URI:
+                logger.critical("❌ MONGO_DB_URI is not set in the environment or .env file. Exiting.")
+                raise ValueError("MONGO_DB_URI is not configured.")
+
+            logger.info(f"🔌 Connecting to MongoDB database: {settings.MONGO_DB_NAME}")
+            try:
+                # Bound the pool so callback storms can't exhaust the server, and
+                # keep a couple of warm connections so the first command after an
+                # idle period doesn't pay TCP+TLS+auth latency.
+                # compressors is a preference list: the driver negotiates the
+                # first one both sides support and silently skips the rest
+                # (zlib is always available as the stdlib fallback).
+                client = AsyncIOMotorClient(
+                    settings.MONGO_DB_URI,
+                    maxPoolSize=20,
+                    minPoolSize=2,
+                    serverSelectionTimeoutMS=3000,
+                    waitQueueTimeoutMS=2000,
+                    compressors="zstd,snappy,zlib",
+                    retryWrites=True
+                )
+                # The ismaster command is cheap and does not require auth.
+                await client.admin.command('ismaster')
+                Database.client = client
+                Database.db = client[settings.MONGO_DB_NAME]
+
+                # Index the lookup keys so URL checks stay O(log n) as the
+                # processed-post history grows, and let Mongo expire old
+                # entries instead of scanning them forever. Index creation
+                # is an optimization — a user without createIndex rights or
+                # a pre-existing conflicting index must not abort startup.
+                try:
+                    await Database.db.processed_posts.create_index("url", unique=True)
+                    await Database.db.processed_posts.create_index(
+                        "processed_at", expireAfterSeconds=7 * 24 * 3600
+                    )
+                    await Database.db.channels.create_index("channel_id", unique=True)
+                    await Database.db.channels.create_index("is_main")
+                except OperationFailure as e:
+                    logger.error(f"Could not ensure indexes, continuing without them: {e}")
+
+                logger.success("✅ MongoDB connection successful.")
+            except ConnectionFailure as e:
+                logger.critical(f"💥 MongoDB connection failed: {e}")
+                raise
 
     @staticmethod
     async def add_processed_post(url: str, content_hash: str, link_count: int):
@@ -56,7 +109,7 @@ class Database:
                     "$set": {
                         "content_hash": content_hash,
                         "link_count": link_count,
-                        "processed_at": datetime.now()
+                        "processed_at": datetime.now(_UTC)
                     }
                 },
                 upsert=True
@@ -64,6 +117,36 @@ class Database:
         except OperationFailure as e:
             logger.error(f"DB Error | Could not add or update processed post for {url}: {e}")
 
+    @staticmethod
+    async def add_processed_posts(batch: list):
+        """
+        Upserts a batch of (url, content_hash, link_count) records with one
+        bulk_write round trip instead of one update per post.
+        """
+        if not batch:
+            return
+        if not Database.db:
+            await Database.initialize()
+        try:
+            now = datetime.now(_UTC)
+            ops = [
+                UpdateOne(
+                    {"url": url},
+                    {
+                        "$set": {
+                            "content_hash": content_hash,
+                            "link_count": link_count,
+                            "processed_at": now
+                        }
+                    },
+                    upsert=True
+                )
+                for url, content_hash, link_count in batch
+            ]
+            await Database.db.processed_posts.bulk_write(ops, ordered=False)
+        except OperationFailure as e:
+            logger.error(f"DB Error | Could not bulk-add {len(batch)} processed posts: {e}")
+
     @staticmethod
     async def is_url_processed(url: str) -> bool:
         """
@@ -72,8 +155,8 @@ class Database:
         if not Database.db:
             await Database.initialize()
         try:
-            post = await Database.db.processed_posts.find_one({"url": url})
-            return bool(post)
+            post = await Database.db.processed_posts.find_one({"url": url}, {"_id": 1})
+            return post is not None
         except OperationFailure as e:
             logger.error(f"DB Error | Could not check if URL is processed {url}: {e}")
             return False
@@ -86,7 +169,9 @@ class Database:
         if not Database.db:
             await Database.initialize()
         try:
-            post = await Database.db.processed_posts.find_one({"url": url})
+            post = await Database.db.processed_posts.find_one(
+                {"url": url}, {"_id": 0, "content_hash": 1}
+            )
             return post.get("content_hash") if post else None
         except OperationFailure as e:
             logger.error(f"DB Error | Could not retrieve post hash for {url}: {e}")
@@ -102,7 +187,7 @@ class Database:
             await Database.initialize()
 
         try:
-            time_threshold = datetime.now() - timedelta(hours=hours)
+            time_threshold = datetime.now(_UTC) - timedelta(hours=hours)
             post = await Database.db.processed_posts.find_one({
                 "url": url,
                 "processed_at": {"$gte": time_threshold}
@@ -112,6 +197,183 @@ class Database:
             logger.error(f"DB Error | Could not check if URL was recently processed {url}: {e}")
             return False  # Assume not processed on error to be safe
 
+    @staticmethod
+    async def add_channel(channel_id: int, channel_name: str) -> bool:
+        """
+        Adds an approved channel. The first channel ever added automatically
+        becomes the main channel. Returns True if it was made the main channel.
+        """
+        if not Database.db:
+            await Database.initialize()
+        try:
+            # Existence check: find_one stops at the first document instead
+            # of counting the whole collection.
+            is_first = await Database.db.channels.find_one({}, {"_id": 1}) is None
+            await Database.db.channels.update_one(
+                {"channel_id": channel_id},
+                {
+                    "$set": {
+                        "channel_name": channel_name,
+                        "approved": True,
+                        "is_main": is_first
+                    }
+                },
+                upsert=True
+            )
+            return is_first
+        except OperationFailure as e:
+            logger.error(f"DB Error | Could not add channel {channel_id}: {e}")
+            return False
+
+    @staticmethod
+    async def get_main_channel() -> dict | None:
+        """
+        Retrieves the channel currently marked as the main channel.
+        """
+        if not Database.db:
+            await Database.initialize()
+        try:
+            return await Database.db.channels.find_one({"is_main": True})
+        except OperationFailure as e:
+            logger.error(f"DB Error | Could not fetch the main channel: {e}")
+            return None
+
+    @staticmethod
+    async def set_main_channel(channel_id: int) -> bool:
+        """
+        Marks the given channel as the main one, clearing the flag elsewhere.
+        """
+        if not Database.db:
+            await Database.initialize()
+        try:
+            await Database.db.channels.update_many({}, {"$set": {"is_main": False}})
+            result = await Database.db.channels.update_one(
+                {"channel_id": channel_id},
+                {"$set": {"is_main": True}}
+            )
+            return result.matched_count > 0
+        except OperationFailure as e:
+            logger.error(f"DB Error | Could not set main channel {channel_id}: {e}")
+            return False
+
+    @staticmethod
+    async def get_total_links() -> int:
+        """
+        Returns the total number of links processed across all posts.
+        """
+        if not Database.db:
+            await Database.initialize()
+        try:
+            pipeline = [{"$group": {"_id": None, "total": {"$sum": "$link_count"}}}]
+            results = await Database.db.processed_posts.aggregate(pipeline).to_list(length=1)
+            return results[0]["total"] if results else 0
+        except OperationFailure as e:
+            logger.error(f"DB Error | Could not compute total link count: {e}")
+            return 0
+
+    @staticmethod
+    async def get_prefix_config() -> tuple[bool, str | None]:
+        """
+        Returns (enabled, prefix) in one round trip, served from a short
+        TTL cache that set_prefix/toggle_prefix invalidate.
+        """
+        cache = Database._prefix_cache
+        if cache["data"] is not None and time.monotonic() - cache["ts"] < Database._PREFIX_CACHE_TTL:
+            return cache["data"]
+        if not Database.db:
+            await Database.initialize()
+        try:
+            config = await Database.db.settings.find_one({"_id": "prefix_config"})
+            data = (
+                bool(config and config.get("enabled")),
+                config.get("prefix") if config else None
+            )
+            cache["data"] = data
+            cache["ts"] = time.monotonic()
+            return data
+        except OperationFailure as e:
+            logger.error(f"DB Error | Could not read the prefix config: {e}")
+            return False, None
+
+    @staticmethod
+    async def is_prefix_enabled() -> bool:
+        """
+        Checks whether the link prefix feature is currently enabled.
+        """
+        enabled, _ = await Database.get_prefix_config()
+        return enabled
+
+    @staticmethod
+    async def get_prefix() -> str | None:
+        """
+        Retrieves the currently configured link prefix, if any.
+        """
+        _, prefix = await Database.get_prefix_config()
+        return prefix
+
+    @staticmethod
+    async def set_prefix(prefix: str):
+        """
+        Stores a new link prefix set by the admin.
+        """
+        if not Database.db:
+            await Database.initialize()
+        try:
+            await Database.db.settings.update_one(
+                {"_id": "prefix_config"},
+                {"$set": {"prefix": prefix}},
+                upsert=True
+            )
+            Database._prefix_cache["ts"] = 0.0
+        except OperationFailure as e:
+            logger.error(f"DB Error | Could not set the prefix: {e}")
+
+    @staticmethod
+    async def toggle_prefix(enabled: bool):
+        """
+        Enables or disables the link prefix feature.
+        """
+        if not Database.db:
+            await Database.initialize()
+        try:
+            await Database.db.settings.update_one(
+                {"_id": "prefix_config"},
+                {"$set": {"enabled": enabled}},
+                upsert=True
+            )
+            Database._prefix_cache["ts"] = 0.0
+        except OperationFailure as e:
+            logger.error(f"DB Error | Could not toggle the prefix feature: {e}")
+
+    @staticmethod
+    async def check_posts(urls: list, hours: int) -> dict:
+        """
+        Fetches the stored state for a whole batch of URLs in one query,
+        replacing the per-URL processed/recent/hash round trips. Returns
+        {url: {"content_hash": ..., "recent": bool}} for known URLs only.
+        """
+        if not Database.db:
+            await Database.initialize()
+        try:
+            threshold = datetime.now(_UTC) - timedelta(hours=hours)
+            cursor = Database.db.processed_posts.find(
+                {"url": {"$in": urls}},
+                {"_id": 0, "url": 1, "content_hash": 1, "processed_at": 1}
+            )
+            state = {}
+            async for doc in cursor:
+                processed_at = doc.get("processed_at")
+                if processed_at is not None and processed_at.tzinfo is None:
+                    processed_at = processed_at.replace(tzinfo=_UTC)
+                state[doc["url"]] = {
+                    "content_hash": doc.get("content_hash"),
+                    "recent": bool(processed_at and processed_at >= threshold)
+                }
+            return state
+        except OperationFailure as e:
+            logger.error(f"DB Error | Could not batch-check {len(urls)} posts: {e}")
+            return {}
+
     @staticmethod
     async def get_all_channels() -> list:
         """
@@ -3,23 +3,214 @@
 # Description: The core web scraping and parsing logic with date/time filtering
 # ==============================================================================
 
+import asyncio
+import functools
 import httpx
 import hashlib
 import re
+import sys
+from aiolimiter import AsyncLimiter
+from dataclasses import dataclass
 from bs4 import BeautifulSoup, Tag
 from loguru import logger
 from core.config import settings
-from datetime import datetime, timedelta
-import pytz
+from datetime import datetime, timedelta, timezone
 from dateutil import parser
 from urllib.parse import urljoin
 
+# The stdlib UTC singleton is a plain fixed-offset object — far cheaper than
+# pytz's localize/astimezone machinery, which this module only ever used for
+# UTC anyway.
+UTC = timezone.utc
+
+# Shared sentinel for "no date found"; sorts below every real timestamp.
+_MIN_UTC = datetime.min.replace(tzinfo=UTC)
+
+# ciso8601 is a C-backed parser, several times faster than dateutil for the
+# ISO 8601 strings that forum time[datetime] attributes carry. dateutil stays
+# as the fallback for the looser formats found in element text.
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+# lxml's C parser is several times faster than html.parser on full post
+# pages; keep the pure-Python parser as a fallback so a deployment
+# missing the wheel still runs, just slower.
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = 'lxml'
+except ImportError:
+    _BS_PARSER = 'html.parser'
+
+def _parse_dt(datetime_str: str) -> datetime:
+    """ Parses a datetime string, trying the fast ISO paths first. """
+    if ciso8601 is not None:
+        try:
+            return ciso8601.parse_datetime(datetime_str)
+        except ValueError:
+            pass
+    else:
+        # C-implemented and handles the ISO forms forum markup emits. Only
+        # a trailing Z needs rewriting; a suffix check beats scanning the
+        # whole string with replace() for the explicit-offset majority.
+        try:
+            if datetime_str.endswith('Z'):
+                datetime_str = datetime_str[:-1] + '+00:00'
+            return datetime.fromisoformat(datetime_str)
+        except ValueError:
+            pass
+    return parser.parse(datetime_str)
+
+# All hot-path patterns compiled once at import, instead of re-keying
+# re's internal cache on every anchor and every post container. The
+# relative-time alternatives are fused into one scan, dispatched on the
+# named group that matched.
+_RELATIVE_TIME_RE = re.compile(
+    r'(?P<minutes>\d+)\s*minutes?\s*ago|'
+    r'(?P<hours>\d+)\s*hours?\s*ago|'
+    r'(?P<days>\d+)\s*days?\s*ago|'
+    r'(?P<yesterday>yesterday)|'
+    r'(?P<today>today)',
+    re.IGNORECASE
+)
+
+def _relative_time(m: re.Match, now: datetime) -> datetime:
+    """ Converts a _RELATIVE_TIME_RE match into an absolute datetime. """
+    group = m.lastgroup
+    if group == 'today':
+        return now
+    if group == 'yesterday':
+        return now - timedelta(days=1)
+    return now - timedelta(**{group: int(m.group(group))})
+
+# Filenames are normalized (fullwidth brackets folded, lowercased) before
+# matching, so the metadata patterns can skip re.IGNORECASE's per-character
+# case folding in the regex engine.
+_BRACKET_TRANS = str.maketrans({'（': '(', '）': ')', '【': '[', '】': ']'})
+
+# Uppercase and strip spaces in one C-level pass per size match, replacing
+# the .replace(...).upper() allocation pair.
+_SIZE_TRANS = str.maketrans('abcdefghijklmnopqrstuvwxyz', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', ' ')
+
+QUALITY_KEYWORDS = {
+    '#PreDVD': ['predvd', 'pre-dvd'], '#CamRip': ['hdcam', 'camrip', 'cam'],
+    '#TC': ['tc', 'telecine'], '#HDRip': ['hdrip', 'hd-rip'],
+    '#WEBDL': ['web-dl', 'webdl', 'web'], '#BluRay': ['bluray', 'blu-ray', 'bdrip'],
+    '#DVDRip': ['dvdrip', 'dvd-rip'], '#WEBRip': ['webrip', 'web-rip'],
+}
+
+# Quality tags accumulate as bits in an int, so the hot loop does one OR
+# per match instead of hashing tag strings into a set.
+_TAG_BIT = {tag: 1 << i for i, tag in enumerate(QUALITY_KEYWORDS)}
+_BIT_TAG = tuple((1 << i, tag) for i, tag in enumerate(QUALITY_KEYWORDS))
+_KEYWORD_BIT = {kw: _TAG_BIT[tag] for tag, kws in QUALITY_KEYWORDS.items() for kw in kws}
+
+# One fused alternation scans each filename once instead of O(tags x
+# keywords) substring checks. Keywords are sorted longest-first across ALL
+# tags — not per group — so e.g. the #WEBRip branch's 'webrip' is tried
+# before the #WEBDL branch's bare 'web' at the same position; the matched
+# keyword text maps back to its tag bit through _KEYWORD_BIT.
+_QUALITY_PATTERN = (
+    '(?P<quality>'
+    + '|'.join(map(re.escape, sorted(_KEYWORD_BIT, key=len, reverse=True)))
+    + ')'
+)
+_QUALITY_RE = re.compile(_QUALITY_PATTERN)
+
+# Quality, size, and language tokens all come from one fused scan per
+# filename, dispatched on which named group matched.
+_META_RE = re.compile(
+    '|'.join((
+        _QUALITY_PATTERN,
+        r'(?P<size>\d+(?:\.\d+)?\s?(?:gb|mb|tb))',
+        r'[\[\(](?P<langs>[a-z\s\+]+)[\]\)]',
+        r'\b(?P<lang>tamil|hindi|telugu|malayalam|kannada|english|multi|tam|hin|tel|mal|kan|eng)\b',
+    ))
+)
+
+@functools.lru_cache(maxsize=4096)
+def _classify_filename(file_name: str) -> tuple[int, frozenset, frozenset]:
+    """
+    Classifies one link title into (quality bitmask, language tags, file
+    sizes). Polling re-scrapes the same posts every cycle, so the vast
+    majority of filenames repeat verbatim — the LRU cache turns those
+    repeats into a single dict hit with zero regex work.
+    """
+    lower_file_name = file_name.translate(_BRACKET_TRANS).lower()
+    quality_mask = 0
+    language_tags = set()
+    file_sizes = set()
+
+    for m in _META_RE.finditer(lower_file_name):
+        group = m.lastgroup
+        if group == 'size':
+            file_sizes.add(m.group('size').translate(_SIZE_TRANS))
+        elif group == 'langs':
+            bracketed = m.group('langs')
+            language_tags.update(lang.strip() for lang in bracketed.split('+'))
+            # Brackets can carry quality tokens too ("[hindi hdrip]")
+            for qm in _QUALITY_RE.finditer(bracketed):
+                quality_mask |= _KEYWORD_BIT[qm.group()]
+        elif group == 'lang':
+            language_tags.add(m.group('lang'))
+        else:
+            quality_mask |= _KEYWORD_BIT[m.group()]
+
+    return quality_mask, frozenset(language_tags), frozenset(file_sizes)
+
+# Selector groups fused into single comma lists so soupsieve walks the tree
+# once per group instead of once per selector string.
+
+# Common datetime selectors for various forum types
+_DATETIME_SELECTOR = (
+    'time[datetime], .ipsType_light time, .ipsType_medium time, '
+    '[data-timestamp], .post-date, .topic-date, .ipsDataItem_meta time, '
+    'abbr[title*="20"], span[title*="20"], .date'
+)
+
+# Forum-specific content containers (mutually exclusive per page) and the
+# rich-text area within one
+_CONTENT_WRAP_SELECTOR = 'div.cPost_contentWrap, div.post-content, div.message-content'
+_RICH_TEXT_SELECTOR = 'div.ipsType_richText, div.post-body'
+
+# All potential torrent/magnet link shapes
+_TORRENT_SELECTOR = (
+    'a[data-fileext="torrent"], a[href*=".torrent"], '
+    'a[href*="torrent"], a[href*="magnet:"]'
+)
+
+# Class tokens that mark a row/item container worth searching for dates
+_ANCESTOR_CLASSES = ('topic', 'post', 'item', 'row', 'stream')
+
+# Post-title anchors across different forum software
+_POST_SELECTOR = (
+    'div[data-rowid] .ipsDataItem_title a, article.ipsStreamItem .ipsDataItem_title a, '
+    '.cTopicList .ipsDataItem_title a, .topic-title a, .topictitle, '
+    '.topic-list .main-link a, h3 a, h4 a, .title a, '
+    '[class*="topic"] a[href*="/topic/"], [class*="post"] a[href*="/topic/"]'
+)
+
+@dataclass(slots=True, frozen=True)
+class Link:
+    """
+    A single scraped download link. Slots keep per-link memory to the two
+    string refs and make attribute access cheaper than dict lookups when a
+    scrape yields hundreds of links.
+    """
+    title: str
+    url: str
+
+
 class ScraperEngine:
     """
     Handles fetching and parsing website content with advanced date/time filtering
     to focus on the latest posts only.
     """
 
+    # Sentinel distinguishing "server says unchanged" from a fetch failure.
+    NOT_MODIFIED = object()
+
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -30,30 +221,106 @@ class ScraperEngine:
             'Pragma': 'no-cache'
         }
 
-    async def _fetch_page(self, url: str) -> str | None:
+        # One client for the engine's lifetime: keep-alive connections turn
+        # every fetch after the first into a pooled request instead of a
+        # fresh TCP+TLS handshake per page. The proxy rides on the
+        # transport — the client-level proxies kwarg was removed in
+        # httpx 0.28.
+        self._client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(proxy=settings.PROXY_URL or None, retries=3),
+            headers=self.headers,
+            # Split timeouts so one hanging endpoint can't stall the whole
+            # fan-out for 45s; a slow read gives up after 15s instead.
+            timeout=httpx.Timeout(connect=5.0, read=15.0, write=5.0, pool=2.0),
+            follow_redirects=True,
+            # keepalive_expiry holds sockets (and their resolved DNS) warm
+            # across the whole post fan-out within a polling cycle.
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60.0),
+            http2=True
+        )
+
+        # Keep the concurrent fan-out polite: at most 10 requests/s to the
+        # origin, so bursts don't trade speed for 429 responses.
+        self._rate = AsyncLimiter(10, 1)
+
+        # The base never changes, so most hrefs resolve with plain string
+        # concatenation instead of urljoin's full parse/reassemble.
+        self._base_url = (settings.TARGET_WEBSITE_URL or '').rstrip('/')
+
+        # Index pages repeat the same timestamp strings ("2 hours ago",
+        # identical ISO attributes) across many sibling rows; memoizing
+        # turns the repeats into dict hits. Cleared per find_latest_posts
+        # pass so entries never go stale or accumulate.
+        self._dt_cache: dict[str, datetime] = {}
+
+        # Conditional-GET state: validators from the last response per URL,
+        # plus the post list from the last full index parse so a 304 can
+        # skip parsing entirely.
+        self._cond_headers: dict[str, dict] = {}
+        self._last_index_urls: list[str] = []
+
+        # Raw-byte fingerprint of each post's last response plus its parsed
+        # result. When a poll re-fetches a byte-identical page, the whole
+        # lxml parse is skipped and the previous result is returned as-is.
+        # Pruned to the current post set on every full index parse so it
+        # never outgrows one polling window.
+        self._page_cache: dict[str, tuple[str, tuple]] = {}
+
+    def _abs_url(self, href: str) -> str:
+        """ Resolves an href against the target site, fast-pathing the
+        absolute and root-relative forms that cover nearly every anchor. """
+        if href.startswith('http'):
+            return href
+        if href.startswith('//'):
+            # Protocol-relative: needs the base's scheme, not its host.
+            return urljoin(self._base_url + '/', href)
+        if href.startswith('/'):
+            return self._base_url + href
+        return urljoin(self._base_url + '/', href)
+
+    async def aclose(self):
+        """ Closes the pooled HTTP client. Call once at bot shutdown. """
+        await self._client.aclose()
+
+    async def _fetch_page(self, url: str, conditional: bool = False) -> bytes | None:
         """
-        Fetches HTML content from a URL with improved error handling and proxy support.
+        Fetches HTML content from a URL with improved error handling and proxy
+        support. Returns raw bytes — lxml sniffs the encoding itself, so
+        decoding to str here would just add a full-body copy.
+
+        With conditional=True, sends the validators saved from the previous
+        response and returns NOT_MODIFIED when the server answers 304.
         """
         try:
-            # Configure transport with retries
-            transport = httpx.AsyncHTTPTransport(retries=3)
-
-            # Configure client with proxy support
-            proxies = None
-            if settings.PROXY_URL:
-                proxies = {"all://": settings.PROXY_URL}
-
-            async with httpx.AsyncClient(
-                transport=transport,
-                proxies=proxies,
-                headers=self.headers,
-                timeout=45.0,
-                follow_redirects=True
-            ) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                logger.info(f"Successfully fetched {url}")
-                return response.text
+            headers = self._cond_headers.get(url) if conditional else None
+            for attempt in range(3):
+                async with self._rate:
+                    response = await self._client.get(url, headers=headers)
+                if response.status_code in (429, 503):
+                    # Server-side throttling: back off exponentially rather
+                    # than failing the post outright.
+                    logger.warning(f"Throttled ({response.status_code}) fetching {url}; backing off")
+                    await asyncio.sleep(2 ** attempt)
+                    continue
+                break
+            if conditional and response.status_code == 304:
+                logger.info(f"Not modified since last fetch: {url}")
+                return ScraperEngine.NOT_MODIFIED
+            response.raise_for_status()
+
+            # Only conditional callers (the index page) ever replay these,
+            # so don't accumulate validators for every post URL fetched.
+            if conditional:
+                validators = {}
+                if response.headers.get('etag'):
+                    validators['If-None-Match'] = response.headers['etag']
+                if response.headers.get('last-modified'):
+                    validators['If-Modified-Since'] = response.headers['last-modified']
+                if validators:
+                    self._cond_headers[url] = validators
+
+            logger.info(f"Successfully fetched {url}")
+            return response.content
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP Error {e.response.status_code} while fetching {url}")
             return None
@@ -64,60 +331,75 @@ class ScraperEngine:
             logger.error(f"Unexpected error fetching {url}: {e}", exc_info=True)
             return None
 
-    def _extract_post_datetime(self, soup: BeautifulSoup, post_container: Tag) -> datetime | None:
+    def _extract_post_datetime(self, soup: BeautifulSoup, post_container: Tag, now: datetime) -> datetime | None:
         """
         Extracts post date/time from various possible locations in the HTML,
-        including absolute timestamps and relative 'time ago' strings.
+        including absolute timestamps and relative 'time ago' strings. The
+        caller snapshots `now` once per pass so relative times across one
+        index page share a single clock read.
         """
         try:
-            # Common datetime selectors for various forum types
-            datetime_selectors = [
-                'time[datetime]', '.ipsType_light time', '.ipsType_medium time',
-                '[data-timestamp]', '.post-date', '.topic-date', '.ipsDataItem_meta time',
-                'abbr[title*="20"]', 'span[title*="20"]', '.date'
-            ]
-            
-            for selector in datetime_selectors:
-                elements = post_container.select(selector) if hasattr(post_container, 'select') else soup.select(selector)
-                for element in elements:
-                    # Try different datetime attributes first
-                    for attr in ['datetime', 'data-timestamp', 'title']:
-                        datetime_str = element.get(attr)
-                        if datetime_str:
-                            try:
-                                # Handle numeric Unix timestamps
-                                if datetime_str.isdigit():
-                                    return datetime.fromtimestamp(int(datetime_str), tz=pytz.UTC)
-                                # Handle various string formats
-                                return parser.parse(datetime_str)
-                            except (ValueError, parser.ParserError):
-                                continue
-                    
-                    # If attributes fail, try the element's text content
-                    text_content = element.get_text(strip=True)
-                    if text_content:
+            scope = post_container if hasattr(post_container, 'select') else soup
+
+            # Fast path: IPS boards put the canonical timestamp in
+            # <time datetime="ISO8601">, which covers nearly every post
+            # without touching the full selector sweep below.
+            time_el = scope.select_one('time[datetime]')
+            if time_el is not None:
+                datetime_str = time_el.get('datetime')
+                if datetime_str:
+                    if datetime_str in self._dt_cache:
+                        return self._dt_cache[datetime_str]
+                    try:
+                        parsed = _parse_dt(datetime_str)
+                        self._dt_cache[datetime_str] = parsed
+                        return parsed
+                    except (ValueError, parser.ParserError):
+                        pass
+
+            for element in scope.select(_DATETIME_SELECTOR):
+                # Try different datetime attributes first
+                for attr in ['datetime', 'data-timestamp', 'title']:
+                    datetime_str = element.get(attr)
+                    if datetime_str:
+                        if datetime_str in self._dt_cache:
+                            return self._dt_cache[datetime_str]
                         try:
-                            return parser.parse(text_content)
+                            # Handle numeric Unix timestamps
+                            if datetime_str.isdigit():
+                                parsed = datetime.fromtimestamp(int(datetime_str), tz=UTC)
+                            else:
+                                # Handle various string formats
+                                parsed = _parse_dt(datetime_str)
+                            self._dt_cache[datetime_str] = parsed
+                            return parsed
                         except (ValueError, parser.ParserError):
                             continue
+
+                # If attributes fail, try the element's text content. A
+                # digit-free or tiny string can never be an absolute date,
+                # so skip the parser tiers entirely for those.
+                text_content = element.get_text(strip=True)
+                if len(text_content) >= 6 and any(ch.isdigit() for ch in text_content):
+                    if text_content in self._dt_cache:
+                        return self._dt_cache[text_content]
+                    try:
+                        parsed = _parse_dt(text_content)
+                        self._dt_cache[text_content] = parsed
+                        return parsed
+                    except (ValueError, parser.ParserError):
+                        continue
             
-            # Fallback to relative time indicators if no absolute time is found
-            relative_time_patterns = [
-                (r'(\d+)\s*minutes?\s*ago', lambda m: datetime.now(pytz.UTC) - timedelta(minutes=int(m.group(1)))),
-                (r'(\d+)\s*hours?\s*ago', lambda m: datetime.now(pytz.UTC) - timedelta(hours=int(m.group(1)))),
-                (r'(\d+)\s*days?\s*ago', lambda m: datetime.now(pytz.UTC) - timedelta(days=int(m.group(1)))),
-                (r'yesterday', lambda m: datetime.now(pytz.UTC) - timedelta(days=1)),
-                (r'today', lambda m: datetime.now(pytz.UTC)),
-            ]
-            
-            page_text = str(post_container) if post_container else str(soup)
-            for pattern, time_func in relative_time_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    return time_func(match)
+            # Fallback to relative time indicators if no absolute time is
+            # found. get_text avoids re-serializing the whole subtree to
+            # HTML just to regex-scan it.
+            page_text = (post_container or soup).get_text(" ", strip=True)
+            match = _RELATIVE_TIME_RE.search(page_text)
+            if match:
+                return _relative_time(match, now)
                     
         except Exception as e:
-            logger.debug(f"Error extracting datetime: {e}")
+            logger.debug("Error extracting datetime: {}", e)
         
         return None
 
@@ -129,30 +411,35 @@ class ScraperEngine:
             logger.warning("No date found for post, assuming it's recent to be safe.")
             return True # If we can't determine the date, process it just in case
             
-        now = datetime.now(pytz.UTC)
-        
+        now = datetime.now(UTC)
+
         # Ensure the post datetime is timezone-aware for accurate comparison
         if post_datetime.tzinfo is None:
-            post_datetime = pytz.UTC.localize(post_datetime)
-        else:
-            post_datetime = post_datetime.astimezone(pytz.UTC)
+            post_datetime = post_datetime.replace(tzinfo=UTC)
+        elif post_datetime.tzinfo is not UTC:
+            post_datetime = post_datetime.astimezone(UTC)
             
         time_diff = now - post_datetime
         is_recent = time_diff <= timedelta(hours=hours_threshold)
         
-        logger.debug(f"Post datetime: {post_datetime}, Current Time: {now}, Difference: {time_diff}, Recent: {is_recent}")
+        # Deferred {} formatting: loguru only renders the message if DEBUG
+        # is actually enabled, so this per-post call is free in production.
+        logger.debug("Post datetime: {}, Current Time: {}, Difference: {}, Recent: {}",
+                     post_datetime, now, time_diff, is_recent)
         return is_recent
 
-    def _parse_links(self, html_content: str) -> tuple[list, str, list, dict]:
+    def _parse_links(self, html_content: bytes) -> tuple[list, str, list, dict]:
         """
         Advanced parser to find download links and extract metadata like quality, language, and file size.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Find the main content container to narrow the search area
-        content_wrap = (soup.find('div', class_='cPost_contentWrap') or
-                        soup.find('div', class_='post-content') or
-                        soup.find('div', class_='message-content') or
+        soup = BeautifulSoup(html_content, _BS_PARSER)
+
+        # Find the main content container to narrow the search area. The
+        # forum-specific shapes are mutually exclusive, so one fused
+        # selector replaces three find() sweeps; the generic article /
+        # .content fallbacks stay separate because they can be ancestors
+        # of the specific containers and must not win over them.
+        content_wrap = (soup.select_one(_CONTENT_WRAP_SELECTOR) or
                         soup.find('article') or
                         soup.find('div', class_='content'))
         
@@ -160,153 +447,196 @@ class ScraperEngine:
             logger.warning("Could not find a primary post content container.")
             return [], "", [], {}
 
-        # Create a hash of the content to detect future edits
-        content_hash = hashlib.md5(str(content_wrap).encode('utf-8')).hexdigest()
-        
-        # Find the rich text area within the container
-        post_content = (content_wrap.find('div', class_='ipsType_richText') or
-                        content_wrap.find('div', class_='post-body') or
-                        content_wrap)
+        # Find the rich text area within the container in one fused pass
+        post_content = content_wrap.select_one(_RICH_TEXT_SELECTOR) or content_wrap
         
         links = []
-        quality_tags = set()
-        metadata = {'language_tags': set(), 'file_sizes': set()}
-
-        QUALITY_KEYWORDS = {
-            '#PreDVD': ['predvd', 'pre-dvd'], '#CamRip': ['hdcam', 'camrip', 'cam'],
-            '#TC': ['tc', 'telecine'], '#HDRip': ['hdrip', 'hd-rip'],
-            '#WEBDL': ['web-dl', 'webdl', 'web'], '#BluRay': ['bluray', 'blu-ray', 'bdrip'],
-            '#DVDRip': ['dvdrip', 'dvd-rip'], '#WEBRip': ['webrip', 'web-rip'],
-        }
-        
-        # Use multiple selectors to find all potential torrent/magnet links
-        torrent_selectors = [
-            'a[data-fileext="torrent"]', 'a[href*=".torrent"]',
-            'a[href*="torrent"]', 'a[href*="magnet:"]'
-        ]
-        
-        torrent_anchors = []
-        for selector in torrent_selectors:
-            found_anchors = post_content.select(selector)
-            if found_anchors:
-                torrent_anchors.extend(found_anchors)
-                logger.debug(f"Found {len(found_anchors)} links with selector: {selector}")
-        
-        # Process unique links to avoid duplicates
-        seen_urls = set()
+        quality_mask = 0
+        # Plain locals in the loop; the metadata dict is built once at the
+        # end instead of being hashed into on every anchor.
+        language_tags: set = set()
+        file_sizes: set = set()
+
+        # One fused selector finds all potential torrent/magnet links in a
+        # single pass over the content tree.
+        torrent_anchors = post_content.select(_TORRENT_SELECTOR)
+        logger.debug("Found {} candidate link anchors", len(torrent_anchors))
+
+        # Deduplicate by href up front (first anchor wins, insertion order
+        # kept) instead of tracking a seen-set inside the parse loop.
+        unique_anchors: dict = {}
         for anchor in torrent_anchors:
-            url = anchor.get('href')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                try:
-                    file_name = anchor.text.strip() or anchor.get('title', '').strip()
-                    if not file_name: continue
-
-                    links.append({'title': file_name, 'url': url})
-                    lower_file_name = file_name.lower()
-
-                    # Extract quality, language, and file size metadata from the link text
-                    for tag, keywords in QUALITY_KEYWORDS.items():
-                        if any(keyword in lower_file_name for keyword in keywords):
-                            quality_tags.add(tag)
-
-                    lang_patterns = [
-                        r'[\[\(]([a-zA-Z\s\+]+)[\]\)]',
-                        r'(tamil|hindi|telugu|malayalam|kannada|english|multi)',
-                        r'(tam|hin|tel|mal|kan|eng)'
-                    ]
-                    for pattern in lang_patterns:
-                        for match in re.findall(pattern, file_name, re.IGNORECASE):
-                            langs = [lang.strip() for lang in match.split('+')] if '+' in match else [match.strip()]
-                            metadata['language_tags'].update(langs)
-
-                    for match in re.findall(r'(\d+(?:\.\d+)?\s?(?:gb|mb|tb))', lower_file_name):
-                        metadata['file_sizes'].add(match.replace(" ", "").upper())
-
-                except Exception as e:
-                    logger.error(f"Error parsing link: {e}", exc_info=True)
-                    continue
+            unique_anchors.setdefault(anchor.get('href'), anchor)
+        unique_anchors.pop(None, None)
+
+        # Resolve each anchor's title once and drop untitled ones here, so
+        # the loop below runs branch-free on the happy path under a single
+        # try instead of paying an exception frame per anchor.
+        candidates = [
+            (url, title)
+            for url, title in (
+                (url, anchor.text.strip() or anchor.get('title', '').strip())
+                for url, anchor in unique_anchors.items()
+            )
+            if title
+        ]
+
+        try:
+            for url, file_name in candidates:
+                # Magnet anchors still contribute quality/language/size
+                # metadata below, but only .torrent links are worth
+                # emitting — the sender drops magnets anyway.
+                if not url.startswith('magnet:'):
+                    links.append(Link(title=file_name, url=url))
+
+                # Quality, language, and size metadata come from the
+                # memoized classifier — a cache hit for any repeated title.
+                mask, langs, sizes = _classify_filename(file_name)
+                quality_mask |= mask
+                language_tags.update(langs)
+                file_sizes.update(sizes)
+        except Exception as e:
+            logger.error(f"Error parsing links: {e}", exc_info=True)
+
+        quality_tags = [tag for bit, tag in _BIT_TAG if quality_mask & bit]
+        metadata = {'language_tags': list(language_tags), 'file_sizes': list(file_sizes)}
+
+        # Fingerprint what the bot actually cares about — the extracted
+        # (title, url) pairs — rather than re-serializing the content
+        # subtree. O(links) instead of O(HTML), and cosmetic markup or
+        # whitespace edits no longer flip the "updated" flag and trigger
+        # spurious re-sends. blake2b over md5: faster, and this is change
+        # detection, not crypto.
+        digest = hashlib.blake2b(digest_size=16)
+        for link in links:
+            digest.update(link.title.encode('utf-8'))
+            digest.update(b'\x00')
+            digest.update(link.url.encode('utf-8'))
+            digest.update(b'\x00')
+        content_hash = digest.hexdigest()
 
         logger.info(f"Parsed {len(links)} download links.")
-        if quality_tags: logger.info(f"Quality tags: {list(quality_tags)}")
-        if metadata['language_tags'] or metadata['file_sizes']: logger.info(f"Metadata: {metadata}")
+        if quality_tags: logger.info(f"Quality tags: {quality_tags}")
+        if language_tags or file_sizes: logger.info(f"Metadata: {metadata}")
 
-        return links, content_hash, list(quality_tags), {k: list(v) for k, v in metadata.items()}
+        return links, content_hash, quality_tags, metadata
 
     async def scrape_post(self, url: str) -> tuple[list, str, list, dict] | None:
         """ Public method to scrape a single post. """
         logger.info(f"Scraping post: {url}")
         html = await self._fetch_page(url)
-        return self._parse_links(html) if html else None
+        if not html:
+            return None
+
+        # Hashing the raw bytes is orders of magnitude cheaper than the
+        # parse it guards; byte-identical responses reuse the last result.
+        raw_hash = hashlib.blake2b(html, digest_size=16).hexdigest()
+        cached = self._page_cache.get(url)
+        if cached is not None and cached[0] == raw_hash:
+            logger.info(f"Page bytes unchanged, reusing parsed result: {url}")
+            return cached[1]
+
+        # Parsing is pure CPU (tree build + regex + hashing); running it in
+        # a worker thread keeps the event loop free for the other in-flight
+        # fetches, and lxml releases the GIL while tokenizing.
+        result = await asyncio.to_thread(self._parse_links, html)
+        self._page_cache[url] = (raw_hash, result)
+        return result
+
+    async def scrape_posts(self, urls: list[str]) -> list:
+        """
+        Scrapes a batch of posts concurrently under a bounded semaphore, so
+        network latency overlaps across posts instead of adding up serially.
+        Results are in input order; failures come back as exception objects.
+        """
+        sem = asyncio.BoundedSemaphore(settings.MAX_CONCURRENT_SCRAPES)
+
+        async def _one(url: str):
+            async with sem:
+                return await self.scrape_post(url)
+
+        return await asyncio.gather(*(_one(url) for url in urls), return_exceptions=True)
 
     async def find_latest_posts(self, max_posts: int = 25, hours_filter: int = 48) -> list[str]:
         """
         Finds the latest posts from the main page using date/time filtering and robust selectors.
         """
         logger.info(f"Checking for posts from the last {hours_filter} hours on {settings.TARGET_WEBSITE_URL}")
-        html = await self._fetch_page(settings.TARGET_WEBSITE_URL)
+        self._dt_cache.clear()
+        html = await self._fetch_page(settings.TARGET_WEBSITE_URL, conditional=True)
+        if html is ScraperEngine.NOT_MODIFIED:
+            logger.info(f"Index page unchanged; reusing {len(self._last_index_urls)} posts from the last parse.")
+            return self._last_index_urls
         if not html:
             logger.error("Failed to fetch main page, cannot find latest posts.")
             return []
         
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Comprehensive list of selectors for different forum software
-        post_selectors = [
-            'div[data-rowid] .ipsDataItem_title a', 'article.ipsStreamItem .ipsDataItem_title a',
-            '.cTopicList .ipsDataItem_title a', '.topic-title a', '.topictitle',
-            '.topic-list .main-link a', 'h3 a', 'h4 a', '.title a',
-            '[class*="topic"] a[href*="/topic/"]', '[class*="post"] a[href*="/topic/"]'
-        ]
-        
+        soup = BeautifulSoup(html, _BS_PARSER)
+
+        # One fused pass over the tree; URL dedup below drops anchors that
+        # several selector shapes matched.
+        elements = soup.select(_POST_SELECTOR)
+        logger.info(f"Found {len(elements)} potential posts")
+
         found_posts = []
-        for selector in post_selectors:
-            elements = soup.select(selector)
-            if not elements: continue
-                
-            logger.info(f"Found {len(elements)} potential posts with selector: '{selector}'")
-            for element in elements:
-                href = element.get('href')
-                if not href: continue
-
-                full_url = urljoin(settings.TARGET_WEBSITE_URL, href)
-
-                # Find the most relevant parent container for date extraction
-                post_container = element
-                for _ in range(5): # Go up a max of 5 levels
-                    if not post_container.parent: break
-                    post_container = post_container.parent
-                    class_str = str(post_container.get('class', []))
-                    if any(cls in class_str for cls in ['topic', 'post', 'item', 'row', 'stream']):
-                        break
-                
-                post_datetime = self._extract_post_datetime(soup, post_container)
-                
-                if self._is_recent_post(post_datetime, hours_filter):
-                    found_posts.append({
-                        'url': full_url,
-                        'datetime': post_datetime,
-                        'title': element.get_text(strip=True)
-                    })
-            if found_posts:
-                break # Stop after the first successful selector finds recent posts
-
-        # Sort posts by datetime (newest first), with a fallback for posts without a date
-        found_posts.sort(
-            key=lambda x: x['datetime'] or datetime.min.replace(tzinfo=pytz.UTC),
-            reverse=True
-        )
+        seen_urls = set()
+        now = datetime.now(UTC)
+        for element in elements:
+            href = element.get('href')
+            if not href: continue
+
+            # Interned so the seen-set membership checks below compare by
+            # pointer on the common hit path.
+            full_url = sys.intern(self._abs_url(href))
+
+            # Dedup at insertion so repeat anchors never pay the expensive
+            # date extraction, and stop scanning once we have a comfortable
+            # margin over max_posts for the recency sort to pick from.
+            if full_url in seen_urls:
+                continue
+            if len(found_posts) >= max_posts * 2:
+                break
+
+            # Find the most relevant parent container for date extraction:
+            # first ancestor whose class list carries a row/item token. The
+            # class attribute is already a list, so no stringifying needed.
+            post_container = next(
+                (p for p in element.parents
+                 if any(token in cls for cls in (p.get('class') or ()) for token in _ANCESTOR_CLASSES)),
+                element.parent
+            )
+
+            post_datetime = self._extract_post_datetime(soup, post_container, now)
+
+            if self._is_recent_post(post_datetime, hours_filter):
+                seen_urls.add(full_url)
+                found_posts.append({
+                    'url': full_url,
+                    'datetime': post_datetime,
+                    'title': element.get_text(strip=True)
+                })
+
+        # Sort posts by datetime (newest first); decorate once so the
+        # comparator never rebuilds the undated-post sentinel.
+        found_posts = [
+            post for _, post in sorted(
+                ((post['datetime'] or _MIN_UTC, post) for post in found_posts),
+                key=lambda pair: pair[0],
+                reverse=True
+            )
+        ]
+
+        # URLs are already unique thanks to insertion-time dedup
+        result_urls = [post['url'] for post in found_posts[:max_posts]]
+        self._last_index_urls = result_urls
+
+        # Evict parsed-page cache entries for posts that fell off the
+        # index, so a long-running daemon doesn't accumulate every post
+        # it has ever seen.
+        current = set(result_urls)
+        for url in [u for u in self._page_cache if u not in current]:
+            del self._page_cache[url]
 
-        # Remove duplicate URLs, preserving the order (newest first)
-        unique_urls = []
-        seen = set()
-        for post in found_posts:
-            if post['url'] not in seen:
-                unique_urls.append(post['url'])
-                seen.add(post['url'])
-        
-        result_urls = unique_urls[:max_posts]
-        
         logger.success(f"Found {len(result_urls)} unique recent posts to process.")
         if result_urls:
             logger.info("Top recent posts:")
@@ -316,4 +646,21 @@ class ScraperEngine:
         
         return result_urls
 
-}
+
+# One engine — and therefore one connection pool — shared by the scheduler
+# job and the /test handler. Closed from the bot's shutdown path.
+_shared_engine: ScraperEngine | None = None
+
+def get_engine() -> ScraperEngine:
+    """ Returns the process-wide ScraperEngine, creating it on first use. """
+    global _shared_engine
+    if _shared_engine is None:
+        _shared_engine = ScraperEngine()
+    return _shared_engine
+
+async def close_engine():
+    """ Closes the shared engine's HTTP client, if one was created. """
+    global _shared_engine
+    if _shared_engine is not None:
+        await _shared_engine.aclose()
+        _shared_engine = None
@@ -3,15 +3,35 @@
 # Description: Improved scheduler with date/time filtering and efficiency
 # ==============================================================================
 
+import asyncio
+import time
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from loguru import logger
 from telegram import Bot
 import re
 from datetime import datetime, timedelta
-from .engine import ScraperEngine
+from .engine import get_engine
 from database.mongo_db import Database
 from bot.messages import format_and_send_links
 
+# The approved-channel set only changes through admin actions, so the
+# per-tick Mongo read is cached with a TTL; the admin handlers call
+# invalidate_channels_cache() on mutation so changes apply immediately.
+_CHANNELS_CACHE_TTL = 300.0
+_channels_cache = {'at': 0.0, 'data': None}
+
+async def _get_channels_cached() -> list:
+    """ Returns the approved channels, refreshing at most once per TTL. """
+    now = time.monotonic()
+    if _channels_cache['data'] is None or now - _channels_cache['at'] > _CHANNELS_CACHE_TTL:
+        _channels_cache['data'] = await Database.get_all_channels()
+        _channels_cache['at'] = now
+    return _channels_cache['data']
+
+def invalidate_channels_cache():
+    """ Drops the cached channel list after an admin approves or reorders channels. """
+    _channels_cache['data'] = None
+
 async def check_website_job(bot: Bot):
     """ 
     Optimized job that focuses on recent posts only for maximum efficiency.
@@ -19,16 +39,16 @@ async def check_website_job(bot: Bot):
     logger.info("🚀 Starting Automatic Website Check")
     start_time = datetime.now()
     
-    # Get configured channels
-    all_channels = await Database.get_all_channels()
+    # Get configured channels (cached between ticks)
+    all_channels = await _get_channels_cached()
     if not all_channels:
         logger.warning("⚠️ No approved channels configured. Skipping job.")
         return
     
     logger.info(f"📢 Will send updates to {len(all_channels)} channels")
     
-    # Initialize scraper with date filtering
-    scraper = ScraperEngine()
+    # Shared engine so every run reuses the same warm connection pool
+    scraper = get_engine()
     
     # Get only recent posts (last 24 hours for frequent checks, 48 hours for safety)
     check_hours = 24  # Adjust based on your check frequency
@@ -39,23 +59,38 @@ async def check_website_job(bot: Bot):
         return
     
     logger.info(f"🔍 Processing {len(latest_post_urls)} recent posts")
-    
+
+    # One batched query replaces the per-URL recently-processed /
+    # is-processed / hash round trips inside the loop.
+    known_posts = await Database.check_posts(latest_post_urls, hours=2)
+
     processed_count = 0
     new_posts_count = 0
     updated_posts_count = 0
-    
-    for i, post_url in enumerate(latest_post_urls, 1):
+    processed_batch = []
+
+    # Filter out recently processed posts (last 2 hours) up front, then
+    # scrape the remainder concurrently so network latency overlaps.
+    to_scrape = []
+    for post_url in latest_post_urls:
+        post_state = known_posts.get(post_url)
+        if post_state and post_state['recent']:
+            logger.info(f"⏭️ Recently processed, skipping: {post_url}")
+            continue
+        to_scrape.append(post_url)
+
+    results = await scraper.scrape_posts(to_scrape)
+
+    for i, (post_url, result) in enumerate(zip(to_scrape, results), 1):
         try:
-            logger.info(f"🔄 [{i}/{len(latest_post_urls)}] Processing: {post_url}")
-            
-            # Quick check if URL was recently processed (last 2 hours) to avoid duplicates
-            if await Database.was_recently_processed(post_url, hours=2):
-                logger.info("⏭️ Recently processed, skipping")
+            logger.info(f"🔄 [{i}/{len(to_scrape)}] Processing: {post_url}")
+
+            post_state = known_posts.get(post_url)
+
+            if isinstance(result, BaseException):
+                logger.error(f"💥 Error scraping {post_url}: {result}")
                 continue
-            
-            # Scrape the post
-            result = await scraper.scrape_post(post_url)
-            
+
             if not result or not result[0]:
                 logger.warning("❌ No download links found, skipping")
                 continue
@@ -65,18 +100,17 @@ async def check_website_job(bot: Bot):
             
             # Extract post title
             post_title_fallback = post_url.split('/')[-2].replace('-', ' ').title()
-            post_title = links[0]['title'].split(' (')[0] if links else post_title_fallback
+            post_title = links[0].title.split(' (')[0] if links else post_title_fallback
             
             # Check if post is new or updated
-            is_processed = await Database.is_url_processed(post_url)
             status = ""
-            
-            if not is_processed:
+
+            if post_state is None:
                 status = "new"
                 new_posts_count += 1
                 logger.success(f"🆕 NEW POST: {post_title}")
             else:
-                old_hash = await Database.get_post_hash(post_url)
+                old_hash = post_state['content_hash']
                 if old_hash != new_hash:
                     status = "updated"
                     updated_posts_count += 1
@@ -85,30 +119,37 @@ async def check_website_job(bot: Bot):
                     logger.info("✅ Post unchanged, skipping")
                     continue
             
-            # Send to all channels if new or updated
+            # Send to all channels concurrently if new or updated; the
+            # semaphore keeps the fan-out under Telegram's burst limits
+            # while overlapping per-channel round-trips.
             if status:
-                send_tasks = []
-                for channel in all_channels:
+                send_sem = asyncio.Semaphore(4)
+
+                async def _send_to_channel(channel):
                     channel_id = channel['channel_id']
                     logger.info(f"📤 Sending to channel: {channel_id}")
-                    
-                    try:
-                        await format_and_send_links(
-                            bot, channel_id, post_title, links, 
-                            status, quality_tags, metadata
-                        )
-                    except Exception as send_error:
-                        logger.error(f"❌ Failed to send to channel {channel_id}: {send_error}")
-                        continue
-                
-                # Update database
-                await Database.add_processed_post(post_url, new_hash, len(links))
+                    async with send_sem:
+                        try:
+                            await format_and_send_links(
+                                bot, channel_id, post_title, links,
+                                status, quality_tags, metadata
+                            )
+                        except Exception as send_error:
+                            logger.error(f"❌ Failed to send to channel {channel_id}: {send_error}")
+
+                await asyncio.gather(*(_send_to_channel(c) for c in all_channels))
+
+                # Queued for one bulk database write after the loop
+                processed_batch.append((post_url, new_hash, len(links)))
                 logger.success(f"✅ Successfully processed: {post_title}")
                 
         except Exception as e:
             logger.error(f"💥 Error processing {post_url}: {e}", exc_info=True)
             continue
     
+    # Record everything processed this tick in a single bulk upsert
+    await Database.add_processed_posts(processed_batch)
+
     # Final summary
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
@@ -132,12 +173,15 @@ def setup_scheduler(bot: Bot):
     
     # Check every 10 minutes for faster updates (you can adjust this)
     scheduler.add_job(
-        check_website_job, 
-        'interval', 
+        check_website_job,
+        'interval',
         minutes=10,  # Reduced from 15 to 10 for faster updates
-        args=[bot], 
+        args=[bot],
         id="main_check_job",
-        max_instances=1  # Prevent overlapping jobs
+        max_instances=1,  # Prevent overlapping jobs
+        coalesce=True,  # Collapse missed runs into one catch-up, not a burst
+        misfire_grace_time=60,
+        replace_existing=True
     )
     
     scheduler.start()